@@ -0,0 +1,268 @@
+"""
+_kernels.py
+Вычислительные ядра алгоритмов над плоскими массивами (компилируются Numba)
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba не установлена - ядра работают как обычный Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _heap_push(keys, vals, size, key, val):
+    """
+    Добавить элемент в бинарную кучу, вернуть новый размер
+
+    Элементы сравниваются парой (key, val), как кортежи в heapq:
+    при равных ключах первым извлекается меньший val
+    """
+    i = size
+    while i > 0:
+        p = (i - 1) >> 1
+        if keys[p] < key or (keys[p] == key and vals[p] <= val):
+            break
+        keys[i] = keys[p]
+        vals[i] = vals[p]
+        i = p
+    keys[i] = key
+    vals[i] = val
+    return size + 1
+
+
+@njit(cache=True)
+def _heap_pop(keys, vals, size):
+    """Извлечь минимум из бинарной кучи: (key, val, новый размер)"""
+    top_key = keys[0]
+    top_val = vals[0]
+    size -= 1
+    last_key = keys[size]
+    last_val = vals[size]
+    i = 0
+    while True:
+        c = 2 * i + 1
+        if c >= size:
+            break
+        if c + 1 < size and (keys[c + 1] < keys[c] or
+                             (keys[c + 1] == keys[c] and vals[c + 1] < vals[c])):
+            c += 1
+        if keys[c] > last_key or (keys[c] == last_key and vals[c] >= last_val):
+            break
+        keys[i] = keys[c]
+        vals[i] = vals[c]
+        i = c
+    keys[i] = last_key
+    vals[i] = last_val
+    return top_key, top_val, size
+
+
+@njit(cache=True)
+def dijkstra_csr(indptr, nbr, w, src, V):
+    """
+    Dijkstra по CSR-смежности
+
+    Returns:
+        (dist, parent) - массивы расстояний и родителей (индексы вершин, -1 - нет)
+    """
+    dist = np.full(V, np.inf)
+    parent = np.full(V, -1, dtype=np.int64)
+
+    # Каждая релаксация кладёт не более одного элемента, а при
+    # неотрицательных весах каждая вершина раскрывается один раз
+    keys = np.empty(nbr.shape[0] + 1, dtype=np.float64)
+    vals = np.empty(nbr.shape[0] + 1, dtype=np.int64)
+
+    dist[src] = 0.0
+    size = _heap_push(keys, vals, 0, 0.0, src)
+
+    while size > 0:
+        du, u, size = _heap_pop(keys, vals, size)
+
+        # Устаревшая запись: вершину уже достали с меньшим расстоянием
+        if du != dist[u]:
+            continue
+
+        for k in range(indptr[u], indptr[u + 1]):
+            v = nbr[k]
+            nd = du + w[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                size = _heap_push(keys, vals, size, nd, v)
+
+    return dist, parent
+
+
+@njit(cache=True)
+def nearest_neighbor_tour_csr(indptr, nbr, w, V):
+    """
+    Жадный TSP (ближайший сосед) из вершины 0 по CSR-смежности
+
+    Returns:
+        (tour, total) - индексы вершин тура и его длина
+    """
+    tour = np.empty(V + 1, dtype=np.int32)
+    visited = np.zeros(V, dtype=np.bool_)
+    tour[0] = 0
+    visited[0] = True
+    length = 1
+    current = 0
+    total = 0.0
+
+    while length < V:
+        # При равных весах берём вершину с меньшим индексом
+        nearest = -1
+        min_dist = np.inf
+        for k in range(indptr[current], indptr[current + 1]):
+            v = nbr[k]
+            if not visited[v] and (w[k] < min_dist or (w[k] == min_dist and v < nearest)):
+                min_dist = w[k]
+                nearest = v
+
+        if nearest == -1:
+            break
+
+        tour[length] = nearest
+        length += 1
+        visited[nearest] = True
+        total += min_dist
+        current = nearest
+
+    # Вернуться к начальной вершине
+    if length == V:
+        back = np.inf
+        for k in range(indptr[current], indptr[current + 1]):
+            if nbr[k] == 0 and w[k] < back:
+                back = w[k]
+        total += back
+        tour[length] = 0
+        length += 1
+
+    return tour[:length], total
+
+
+@njit(cache=True)
+def connected_components_csr(indptr, nbr, V):
+    """
+    Компоненты связности итеративным DFS по CSR-смежности
+
+    Returns:
+        comp_id - номер компоненты каждой вершины (в порядке обнаружения)
+    """
+    comp_id = np.full(V, -1, dtype=np.int32)
+    visited = np.zeros(V, dtype=np.bool_)
+    # Вершина кладётся в стек не более одного раза
+    stack = np.empty(V, dtype=np.int32)
+    num_components = 0
+
+    for s in range(V):
+        if visited[s]:
+            continue
+        visited[s] = True
+        stack[0] = s
+        sp = 1
+        while sp > 0:
+            sp -= 1
+            u = stack[sp]
+            comp_id[u] = num_components
+            for k in range(indptr[u], indptr[u + 1]):
+                v = nbr[k]
+                if not visited[v]:
+                    visited[v] = True
+                    stack[sp] = v
+                    sp += 1
+        num_components += 1
+
+    return comp_id
+
+
+@njit(cache=True)
+def bfs_relax_csr(indptr, nbr, src, dist, owner):
+    """
+    BFS от нового источника поверх уже посчитанных расстояний
+
+    Обновляет dist/owner на месте только там, где src строго ближе
+    прежних источников, поэтому при равенстве остаётся более ранний
+    """
+    V = dist.shape[0]
+    queue = np.empty(V, dtype=np.int32)
+    dist[src] = 0
+    owner[src] = src
+    queue[0] = src
+    head = 0
+    tail = 1
+
+    while head < tail:
+        u = queue[head]
+        head += 1
+        nd = dist[u] + 1
+        for k in range(indptr[u], indptr[u + 1]):
+            v = nbr[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                owner[v] = src
+                queue[tail] = v
+                tail += 1
+
+
+@njit(cache=True)
+def _find(parent, x):
+    """find без рекурсии: найти корень, затем перевесить весь путь на него"""
+    r = x
+    while parent[r] != r:
+        r = parent[r]
+    while parent[x] != r:
+        nxt = parent[x]
+        parent[x] = r
+        x = nxt
+    return r
+
+
+@njit(cache=True)
+def kruskal_core(sorted_u, sorted_v, sorted_w, V):
+    """
+    Kruskal по рёбрам, уже отсортированным по весу
+
+    Returns:
+        (mst_u, mst_v, mst_w, total) - рёбра остова и его суммарный вес
+    """
+    parent = np.arange(V).astype(np.int32)
+    rank = np.zeros(V, dtype=np.int32)
+
+    max_edges = max(V - 1, 0)
+    mst_u = np.empty(max_edges, dtype=np.int32)
+    mst_v = np.empty(max_edges, dtype=np.int32)
+    mst_w = np.empty(max_edges, dtype=np.float64)
+    count = 0
+    total = 0.0
+
+    for k in range(sorted_u.shape[0]):
+        x = _find(parent, sorted_u[k])
+        y = _find(parent, sorted_v[k])
+
+        if x == y:
+            continue
+
+        # union по рангу
+        if rank[x] < rank[y]:
+            x, y = y, x
+        parent[y] = x
+        if rank[x] == rank[y]:
+            rank[x] += 1
+
+        mst_u[count] = sorted_u[k]
+        mst_v[count] = sorted_v[k]
+        mst_w[count] = sorted_w[k]
+        total += sorted_w[k]
+        count += 1
+
+        # Остов уже содержит V-1 рёбер - остальные рёбра не нужны
+        if count == max_edges:
+            break
+
+    return mst_u[:count], mst_v[:count], mst_w[:count], total
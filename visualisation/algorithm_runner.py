@@ -1,52 +1,80 @@
 """
 algorithm_runner.py
-Запуск алгоритмов через subprocess и обработка результатов
+Запуск алгоритмов на графе и обработка результатов
 """
 
-import subprocess
 import json
-import os
-import tempfile
-import sys
+import numpy as np
 from typing import Dict, List, Tuple, Any
 
+from _kernels import (dijkstra_csr, kruskal_core, connected_components_csr,
+                      bfs_relax_csr, nearest_neighbor_tour_csr)
+
 class AlgorithmRunner:
-    """Запускает C++ алгоритмы и возвращает результаты"""
-    
-    def __init__(self, cpp_executable: str = "main.exe"):
-        self.cpp_exe = cpp_executable
-        self.temp_graph_file = None
-        self.temp_output_file = None
+    """Запускает алгоритмы на графе и возвращает результаты"""
     
     @staticmethod
-    def graph_to_cpp_format(graph_data: Dict) -> str:
+    def _normalize(graph_data: Dict) -> Tuple[Dict, np.ndarray, np.ndarray, np.ndarray]:
         """
-        Конвертирует граф в формат для C++ программы
-        Формат: количество вершин, количество ребер, потом все ребра (from to weight)
+        Привести рёбра к параллельным массивам индексов и весов
+        
+        Результат кэшируется в graph_data и пересчитывается,
+        если списки вершин или рёбер заменены или изменилась их длина
+        
+        Returns:
+            (vid, u, v, w) - индекс вершины по её id и массивы концов/весов рёбер
         """
         vertices = graph_data['vertices']
         edges = graph_data['edges']
         
-        lines = []
-        lines.append(f"{len(vertices)} {len(edges)}")
+        cached = graph_data.get('_normalized')
+        if (cached is not None and cached[0] is vertices and cached[1] is edges
+                and cached[2] == (len(vertices), len(edges))):
+            return cached[3]
+        
+        vid = {v: i for i, v in enumerate(vertices)}
+        m = len(edges)
+        u = np.empty(m, dtype=np.int32)
+        v = np.empty(m, dtype=np.int32)
+        w = np.empty(m, dtype=np.float64)
+        for k, edge in enumerate(edges):
+            u[k] = vid[edge[0]]
+            v[k] = vid[edge[1]]
+            w[k] = edge[2] if len(edge) == 3 else 1.0
+        
+        normalized = (vid, u, v, w)
+        graph_data['_normalized'] = (vertices, edges, (len(vertices), len(edges)), normalized)
+        return normalized
+    
+    @staticmethod
+    def _build_csr(n: int, u: np.ndarray, v: np.ndarray, w: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Построить CSR-представление неориентированного графа
         
-        for edge in edges:
-            if len(edge) == 3:
-                v1, v2, weight = edge
-            else:
-                v1, v2 = edge
-                weight = 1.0
-            lines.append(f"{v1} {v2} {weight:.2f}")
+        Returns:
+            (indptr, nbr, w) - соседи вершины i лежат в nbr[indptr[i]:indptr[i+1]]
+        """
+        # Каждое ребро даёт две дуги; чередуем их, чтобы сохранить порядок рёбер
+        src = np.column_stack((u, v)).ravel()
+        dst = np.column_stack((v, u)).ravel()
+        order = np.argsort(src, kind='stable')
         
-        return "\n".join(lines)
+        indptr = np.concatenate(([0], np.bincount(src, minlength=n).cumsum()))
+        return indptr, dst[order], np.repeat(w, 2)[order]
     
     @staticmethod
-    def save_graph_temp(graph_data: Dict) -> str:
-        """Сохранить граф во временный файл"""
-        content = AlgorithmRunner.graph_to_cpp_format(graph_data)
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(content)
-            return f.name
+    def _csr(graph_data: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """CSR-смежность графа, строится один раз и кэшируется в graph_data"""
+        normalized = AlgorithmRunner._normalize(graph_data)
+        
+        cached = graph_data.get('_csr')
+        if cached is not None and cached[0] is normalized:
+            return cached[1]
+        
+        _, u, v, w = normalized
+        csr = AlgorithmRunner._build_csr(len(graph_data['vertices']), u, v, w)
+        graph_data['_csr'] = (normalized, csr)
+        return csr
     
     @staticmethod
     def run_algorithm(algorithm_name: str, graph_data: Dict) -> Dict[str, Any]:
@@ -55,6 +83,14 @@ class AlgorithmRunner:
         
         Локально реализуем базовые алгоритмы на Python
         для демонстрации
+        
+        Рёбра и CSR-смежность кэшируются прямо в graph_data (ключи '_normalized'
+        и '_csr', внутри - ndarray). Поэтому:
+        - после первого вызова не меняйте рёбра на месте: добавление/удаление
+          замечается по длине списков, а правка веса или концов ребра - нет;
+          вместо этого присвойте graph_data['edges'] новый список;
+        - json.dumps(graph_data) с этими ключами не сработает - сохраняйте
+          через GraphGenerator.save_graph или отбросьте ключи с "_"
         """
         
         if algorithm_name == "dijkstra":
@@ -74,48 +110,29 @@ class AlgorithmRunner:
     
     @staticmethod
     def run_dijkstra(graph_data: Dict, start: int = 0) -> Dict[str, Any]:
-        """Реализация Dijkstra на Python"""
-        import heapq
-        
+        """Dijkstra по CSR-смежности (ядро в _kernels)"""
         vertices = graph_data['vertices']
         if not vertices or start not in vertices:
             start = vertices[0] if vertices else 0
         
-        # Построить граф смежности
-        adj = {v: [] for v in vertices}
-        for edge in graph_data['edges']:
-            if len(edge) == 3:
-                v1, v2, weight = edge
-            else:
-                v1, v2 = edge
-                weight = 1.0
-            adj[v1].append((v2, weight))
-            adj[v2].append((v1, weight))
+        n = len(vertices)
+        vid = AlgorithmRunner._normalize(graph_data)[0]
+        indptr, nbr, w = AlgorithmRunner._csr(graph_data)
+        
+        # Dijkstra корректен только для неотрицательных весов
+        if (w < 0).any():
+            return {"error": "Dijkstra requires non-negative edge weights", "success": False}
         
         # Dijkstra
-        distances = {v: float('inf') for v in vertices}
-        distances[start] = 0
-        parent = {v: -1 for v in vertices}
-        pq = [(0, start)]
-        visited = set()
-        
-        while pq:
-            curr_dist, u = heapq.heappop(pq)
-            
-            if u in visited:
-                continue
-            visited.add(u)
-            
-            for v, weight in adj[u]:
-                if v not in visited and distances[u] + weight < distances[v]:
-                    distances[v] = distances[u] + weight
-                    parent[v] = u
-                    heapq.heappush(pq, (distances[v], v))
+        if n:
+            dist, parent = dijkstra_csr(indptr, nbr, w, vid[start], n)
+        else:
+            dist, parent = np.empty(0), np.empty(0, dtype=np.int64)
         
         return {
             "algorithm": "Dijkstra",
-            "distances": {str(v): float(distances[v]) for v in vertices},
-            "parent": {str(v): parent[v] for v in vertices},
+            "distances": {str(v): float(dist[i]) for i, v in enumerate(vertices)},
+            "parent": {str(v): vertices[p] if p != -1 else -1 for v, p in zip(vertices, parent.tolist())},
             "start": start,
             "success": True
         }
@@ -127,51 +144,16 @@ class AlgorithmRunner:
         if not vertices:
             return {"error": "Empty graph", "success": False}
         
-        start = vertices[0]
-        
-        # Построить матрицу весов
-        adj = {v: {u: float('inf') for u in vertices} for v in vertices}
-        for edge in graph_data['edges']:
-            if len(edge) == 3:
-                v1, v2, weight = edge
-            else:
-                v1, v2 = edge
-                weight = 1.0
-            adj[v1][v2] = weight
-            adj[v2][v1] = weight
-        
-        # Nearest Neighbor
-        tour = [start]
-        visited = {start}
-        current = start
-        total_distance = 0.0
-        
-        while len(visited) < len(vertices):
-            nearest = -1
-            min_dist = float('inf')
-            
-            for v in vertices:
-                if v not in visited and adj[current][v] < min_dist:
-                    min_dist = adj[current][v]
-                    nearest = v
-            
-            if nearest == -1:
-                break
-            
-            tour.append(nearest)
-            visited.add(nearest)
-            total_distance += min_dist
-            current = nearest
+        indptr, nbr, w = AlgorithmRunner._csr(graph_data)
         
-        # Вернуться к начальной вершине
-        if len(tour) == len(vertices):
-            total_distance += adj[current][start]
-            tour.append(start)
+        # Nearest Neighbor (в пространстве индексов)
+        tour, total_distance = nearest_neighbor_tour_csr(indptr, nbr, w, len(vertices))
+        tour = [vertices[i] for i in tour.tolist()]
         
         return {
             "algorithm": "TSP (Nearest Neighbor)",
             "tour": tour,
-            "total_distance": round(total_distance, 2),
+            "total_distance": round(float(total_distance), 2),
             "vertices_visited": len(tour) - 1,
             "success": True
         }
@@ -180,55 +162,25 @@ class AlgorithmRunner:
     def run_mst(graph_data: Dict) -> Dict[str, Any]:
         """MST - Kruskal Algorithm"""
         vertices = graph_data['vertices']
-        edges = graph_data['edges']
         
         if not vertices:
             return {"error": "Empty graph", "success": False}
         
-        # Union-Find
-        parent = {v: v for v in vertices}
-        rank = {v: 0 for v in vertices}
-        
-        def find(x):
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
-        
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px == py:
-                return False
-            if rank[px] < rank[py]:
-                px, py = py, px
-            parent[py] = px
-            if rank[px] == rank[py]:
-                rank[px] += 1
-            return True
-        
-        # Сортируем ребра
-        sorted_edges = []
-        for edge in edges:
-            if len(edge) == 3:
-                v1, v2, weight = edge
-            else:
-                v1, v2 = edge
-                weight = 1.0
-            sorted_edges.append((weight, v1, v2))
-        sorted_edges.sort()
+        _, u, v, w = AlgorithmRunner._normalize(graph_data)
         
-        # Kruskal
-        mst_edges = []
-        total_weight = 0.0
+        # Сортируем ребра по весу (при равенстве - по концам, как раньше)
+        order = np.lexsort((v, u, w))
+        sorted_u, sorted_v, sorted_w = u[order], v[order], w[order]
         
-        for weight, u, v in sorted_edges:
-            if union(u, v):
-                mst_edges.append((u, v, weight))
-                total_weight += weight
+        # Kruskal
+        mst_u, mst_v, mst_w, total_weight = kruskal_core(sorted_u, sorted_v, sorted_w, len(vertices))
+        mst_edges = [(vertices[u], vertices[v], weight)
+                     for u, v, weight in zip(mst_u.tolist(), mst_v.tolist(), mst_w.tolist())]
         
         return {
             "algorithm": "MST (Kruskal)",
             "mst_edges": mst_edges,
-            "total_weight": round(total_weight, 2),
+            "total_weight": round(float(total_weight), 2),
             "num_edges": len(mst_edges),
             "is_connected": len(mst_edges) == len(vertices) - 1,
             "success": True
@@ -238,34 +190,20 @@ class AlgorithmRunner:
     def run_connectivity(graph_data: Dict) -> Dict[str, Any]:
         """Компоненты связности - DFS"""
         vertices = graph_data['vertices']
-        edges = graph_data['edges']
         
         if not vertices:
             return {"error": "Empty graph", "success": False}
         
-        # Построить граф смежности
-        adj = {v: [] for v in vertices}
-        for edge in edges:
-            v1, v2 = edge[0], edge[1]
-            adj[v1].append(v2)
-            adj[v2].append(v1)
-        
-        # DFS
-        visited = set()
-        components = []
-        
-        def dfs(v, component):
-            visited.add(v)
-            component.append(v)
-            for u in adj[v]:
-                if u not in visited:
-                    dfs(u, component)
-        
-        for v in vertices:
-            if v not in visited:
-                component = []
-                dfs(v, component)
-                components.append(sorted(component))
+        indptr, nbr, _ = AlgorithmRunner._csr(graph_data)
+        
+        # Итеративный DFS
+        comp_id = connected_components_csr(indptr, nbr, len(vertices))
+        
+        # Одна сортировка: по компоненте, внутри компоненты - по id вершины
+        ids = np.asarray(vertices)
+        sorted_ids = ids[np.lexsort((ids, comp_id))].tolist()
+        bounds = np.concatenate(([0], np.bincount(comp_id).cumsum())).tolist()
+        components = [sorted_ids[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
         
         return {
             "algorithm": "Connectivity (DFS)",
@@ -280,32 +218,31 @@ class AlgorithmRunner:
     def run_coloring(graph_data: Dict) -> Dict[str, Any]:
         """Раскраска графа - Greedy"""
         vertices = graph_data['vertices']
-        edges = graph_data['edges']
         
         if not vertices:
             return {"error": "Empty graph", "success": False}
         
-        # Построить граф смежности
-        adj = {v: set() for v in vertices}
-        for edge in edges:
-            v1, v2 = edge[0], edge[1]
-            adj[v1].add(v2)
-            adj[v2].add(v1)
+        indptr, nbr, _ = AlgorithmRunner._csr(graph_data)
+        ptr = indptr.tolist()
+        nbr = nbr.tolist()
         
-        # Greedy coloring
-        coloring = {v: -1 for v in vertices}
+        # Greedy coloring: цвет вершины хранится битом 1 << color,
+        # у ещё не раскрашенных вершин маска 0
+        masks = [0] * len(vertices)
+        colors = [0] * len(vertices)
         
-        for v in vertices:
-            # Найти используемые цвета у соседей
-            neighbor_colors = {coloring[u] for u in adj[v] if coloring[u] != -1}
-            
-            # Найти первый доступный цвет
-            color = 0
-            while color in neighbor_colors:
-                color += 1
+        for i in range(len(vertices)):
+            # Объединить цвета соседей в одну маску
+            used = 0
+            for j in nbr[ptr[i]:ptr[i + 1]]:
+                used |= masks[j]
             
-            coloring[v] = color
+            # Первый доступный цвет - младший нулевой бит маски
+            free = ~used & (used + 1)
+            masks[i] = free
+            colors[i] = free.bit_length() - 1
         
+        coloring = dict(zip(vertices, colors))
         chromatic_number = max(coloring.values()) + 1 if coloring else 0
         
         return {
@@ -320,62 +257,35 @@ class AlgorithmRunner:
     def run_hotel_optimization(graph_data: Dict) -> Dict[str, Any]:
         """Hotel Optimization - K-Centers approximation"""
         vertices = graph_data['vertices']
-        edges = graph_data['edges']
         
         if not vertices:
             return {"error": "Empty graph", "success": False}
         
-        # Построить матрицу расстояний (BFS)
-        from collections import deque
-        
-        adj = {v: [] for v in vertices}
-        for edge in edges:
-            v1, v2 = edge[0], edge[1]
-            adj[v1].append(v2)
-            adj[v2].append(v1)
-        
-        def bfs_distance(start, end):
-            if start == end:
-                return 0
-            visited = {start}
-            q = deque([(start, 0)])
-            while q:
-                u, dist = q.popleft()
-                for v in adj[u]:
-                    if v == end:
-                        return dist + 1
-                    if v not in visited:
-                        visited.add(v)
-                        q.append((v, dist + 1))
-            return float('inf')
+        n = len(vertices)
+        indptr, nbr, _ = AlgorithmRunner._csr(graph_data)
         
-        # Выбираем центры грeedily (K-Centers)
-        k = max(1, len(vertices) // 3 + 1)  # Примерно 1/3 вершин
-        centers = [vertices[0]]
+        # Расстояние до ближайшего центра и сам центр (multi-source BFS)
+        INF = np.iinfo(np.int32).max
+        dist = np.full(n, INF, dtype=np.int32)
+        owner = np.full(n, -1, dtype=np.int32)
         
-        for _ in range(min(k - 1, len(vertices) - 1)):
-            farthest = -1
-            max_min_dist = -1
-            
-            for v in vertices:
-                if v in centers:
-                    continue
-                min_dist = min(bfs_distance(v, c) for c in centers)
-                if min_dist > max_min_dist:
-                    max_min_dist = min_dist
-                    farthest = v
-            
-            if farthest != -1:
-                centers.append(farthest)
-        
-        # Назначаем вершины центрам
-        assignment = {}
-        max_dist = 0
-        for v in vertices:
-            nearest = min(centers, key=lambda c: bfs_distance(v, c))
-            dist = bfs_distance(v, nearest)
-            assignment[v] = nearest
-            max_dist = max(max_dist, dist)
+        # Выбираем центры грeedily (K-Centers)
+        k = max(1, n // 3 + 1)  # Примерно 1/3 вершин
+        centers = [0]
+        bfs_relax_csr(indptr, nbr, 0, dist, owner)
+        
+        for _ in range(min(k - 1, n - 1)):
+            farthest = int(dist.argmax())
+            centers.append(farthest)
+            bfs_relax_csr(indptr, nbr, farthest, dist, owner)
+        
+        # Назначаем вершины центрам (недостижимые - первому центру)
+        assignment = {v: vertices[c] if c != -1 else vertices[0]
+                      for v, c in zip(vertices, owner.tolist())}
+        max_dist = int(dist.max())
+        if max_dist == INF:
+            max_dist = float('inf')
+        centers = [vertices[c] for c in centers]
         
         return {
             "algorithm": "Hotel Optimization (K-Centers)",
@@ -388,6 +298,7 @@ class AlgorithmRunner:
 
 
 if __name__ == "__main__":
+    from concurrent.futures import ProcessPoolExecutor
     from graph_generator import GraphGenerator
     
     gen = GraphGenerator()
@@ -395,8 +306,12 @@ if __name__ == "__main__":
     
     print("=== Testing Algorithms ===\n")
     
-    for algo in ["dijkstra", "tsp", "mst", "connectivity", "coloring", "hotel"]:
-        result = AlgorithmRunner.run_algorithm(algo, graph)
-        print(f"{result['algorithm']}:")
-        print(json.dumps(result, indent=2, default=str))
-        print()
\ No newline at end of file
+    # Алгоритмы независимы - запускаем их параллельно в отдельных процессах
+    algos = ["dijkstra", "tsp", "mst", "connectivity", "coloring", "hotel"]
+    with ProcessPoolExecutor() as ex:
+        futures = {algo: ex.submit(AlgorithmRunner.run_algorithm, algo, graph) for algo in algos}
+        for algo, future in futures.items():
+            result = future.result()
+            print(f"{result['algorithm']}:")
+            print(json.dumps(result, indent=2, default=str))
+            print()
\ No newline at end of file
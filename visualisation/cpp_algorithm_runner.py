@@ -0,0 +1,46 @@
+"""
+cpp_algorithm_runner.py
+Подготовка графа для C++ реализации алгоритмов
+"""
+
+import tempfile
+from typing import Dict
+
+from algorithm_runner import AlgorithmRunner
+
+
+class CppAlgorithmRunner(AlgorithmRunner):
+    """Готовит входные данные для C++ алгоритмов"""
+    
+    def __init__(self, cpp_executable: str = "main.exe"):
+        self.cpp_exe = cpp_executable
+    
+    @staticmethod
+    def graph_to_cpp_format(graph_data: Dict) -> str:
+        """
+        Конвертирует граф в формат для C++ программы
+        Формат: количество вершин, количество ребер, потом все ребра (from to weight)
+        """
+        vertices = graph_data['vertices']
+        edges = graph_data['edges']
+        
+        lines = []
+        lines.append(f"{len(vertices)} {len(edges)}")
+        
+        for edge in edges:
+            if len(edge) == 3:
+                v1, v2, weight = edge
+            else:
+                v1, v2 = edge
+                weight = 1.0
+            lines.append(f"{v1} {v2} {weight:.2f}")
+        
+        return "\n".join(lines)
+    
+    @staticmethod
+    def save_graph_temp(graph_data: Dict) -> str:
+        """Сохранить граф во временный файл"""
+        content = CppAlgorithmRunner.graph_to_cpp_format(graph_data)
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+            f.write(content)
+            return f.name
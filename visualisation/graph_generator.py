@@ -3,8 +3,8 @@ graph_generator.py
 Генератор случайных неориентированных графов
 """
 
-import random
 import json
+import numpy as np
 from typing import Dict, List, Tuple
 
 class GraphGenerator:
@@ -12,7 +12,7 @@ class GraphGenerator:
     
     def __init__(self, seed: int = None):
         if seed is not None:
-            random.seed(seed)
+            np.random.seed(seed)
     
     @staticmethod
     def generate_random_graph(
@@ -43,28 +43,30 @@ class GraphGenerator:
         
         # Создаём вершины
         vertices = list(range(num_vertices))
-        edges = set()
+        path_v1 = path_v2 = np.empty(0, dtype=np.int64)
         
         # Если нужно гарантировать связность - создаём путь через все вершины
         if connected and num_vertices > 1:
-            shuffled = vertices.copy()
-            random.shuffle(shuffled)
-            for i in range(len(shuffled) - 1):
-                weight = round(random.uniform(min_weight, max_weight), 2)
-                edge = tuple(sorted([shuffled[i], shuffled[i + 1]]))
-                edges.add((edge[0], edge[1], weight))
+            shuffled = np.random.permutation(num_vertices)
+            path_v1 = np.minimum(shuffled[:-1], shuffled[1:])
+            path_v2 = np.maximum(shuffled[:-1], shuffled[1:])
         
-        # Добавляем случайные ребра
-        for v1 in range(num_vertices):
-            for v2 in range(v1 + 1, num_vertices):
-                if random.random() < edge_probability:
-                    if (v1, v2) not in edges and (v2, v1) not in edges:
-                        weight = round(random.uniform(min_weight, max_weight), 2)
-                        edges.add((v1, v2, weight))
+        # Добавляем случайные ребра (все пары v1 < v2 разом)
+        v1, v2 = np.triu_indices(num_vertices, 1)
+        mask = np.random.random(v1.size) < edge_probability
+        
+        # Ребро пути не дублируем: номер пары (a, b) в порядке triu_indices
+        mask[path_v1 * num_vertices - path_v1 * (path_v1 + 1) // 2 + path_v2 - path_v1 - 1] = False
+        v1 = np.concatenate((path_v1, v1[mask]))
+        v2 = np.concatenate((path_v2, v2[mask]))
+        
+        # Веса всех рёбер - одной выборкой
+        weights = np.round(np.random.uniform(min_weight, max_weight, v1.size), 2)
+        edges = list(zip(v1.tolist(), v2.tolist(), weights.tolist()))
         
         return {
             'vertices': vertices,
-            'edges': list(edges),
+            'edges': edges,
             'num_vertices': num_vertices,
             'num_edges': len(edges)
         }
@@ -104,10 +106,8 @@ class GraphGenerator:
     def generate_complete_graph(num_vertices: int, edge_weight: float = 1.0) -> Dict:
         """Полный граф (все с каждым)"""
         vertices = list(range(num_vertices))
-        edges = []
-        for v1 in range(num_vertices):
-            for v2 in range(v1 + 1, num_vertices):
-                edges.append((v1, v2, edge_weight))
+        v1, v2 = np.triu_indices(num_vertices, 1)
+        edges = list(zip(v1.tolist(), v2.tolist(), [edge_weight] * v1.size))
         
         return {
             'vertices': vertices,
@@ -120,17 +120,14 @@ class GraphGenerator:
     def generate_grid_graph(rows: int, cols: int, edge_weight: float = 1.0) -> Dict:
         """Граф-сетка (grid)"""
         vertices = list(range(rows * cols))
-        edges = []
         
-        for r in range(rows):
-            for c in range(cols):
-                v = r * cols + c
-                # Ребро вправо
-                if c < cols - 1:
-                    edges.append((v, v + 1, edge_weight))
-                # Ребро вниз
-                if r < rows - 1:
-                    edges.append((v, v + cols, edge_weight))
+        # Для каждой вершины два кандидата: ребро вправо и ребро вниз
+        v = np.arange(rows * cols)
+        r, c = np.divmod(v, cols)
+        v1 = np.repeat(v, 2)
+        v2 = np.column_stack((v + 1, v + cols)).ravel()
+        valid = np.column_stack((c < cols - 1, r < rows - 1)).ravel()
+        edges = list(zip(v1[valid].tolist(), v2[valid].tolist(), [edge_weight] * int(valid.sum())))
         
         return {
             'vertices': vertices,
@@ -142,8 +139,10 @@ class GraphGenerator:
     @staticmethod
     def save_graph(graph: Dict, filename: str) -> None:
         """Сохранить граф в JSON"""
+        # Ключи с "_" - служебные кэши (например, AlgorithmRunner._normalize)
+        data = {k: v for k, v in graph.items() if not k.startswith('_')}
         with open(filename, 'w') as f:
-            json.dump(graph, f, indent=2)
+            json.dump(data, f, indent=2)
     
     @staticmethod
     def load_graph(filename: str) -> Dict:
@@ -19,37 +19,46 @@ class GraphVisualizer:
         self.pos = None
         self.fig = None
         self.ax = None
+        self._layout_cache: Dict[str, Dict] = {}
     
     def create_from_dict(self, graph_data: Dict) -> None:
         """Создать NetworkX граф из dictionary"""
         self.G = nx.Graph()
+        self._layout_cache = {}
         
         # Добавляем вершины
-        for v in graph_data['vertices']:
-            self.G.add_node(v)
+        self.G.add_nodes_from(graph_data['vertices'])
         
         # Добавляем ребра с весами
-        for edge in graph_data['edges']:
-            if len(edge) == 3:
-                v1, v2, weight = edge
-                self.G.add_edge(v1, v2, weight=weight)
-            else:
-                v1, v2 = edge
-                self.G.add_edge(v1, v2, weight=1.0)
+        self.G.add_edges_from(
+            (edge[0], edge[1], {'weight': edge[2] if len(edge) == 3 else 1.0})
+            for edge in graph_data['edges']
+        )
     
-    def compute_layout(self, layout: str = 'spring') -> None:
-        """Вычислить позиции вершин"""
+    def compute_layout(self, layout: str = 'spring', pos: Optional[Dict] = None) -> None:
+        """
+        Вычислить позиции вершин
+        
+        Позиции кэшируются для текущего графа, повторный вызов с тем же
+        layout их не пересчитывает. Готовые позиции можно передать в pos
+        """
         if self.G is None:
             raise ValueError("Graph not created. Use create_from_dict() first")
         
-        if layout == 'spring':
-            self.pos = nx.spring_layout(self.G, k=2, iterations=50, seed=42)
-        elif layout == 'circular':
-            self.pos = nx.circular_layout(self.G)
-        elif layout == 'kamada_kawai':
-            self.pos = nx.kamada_kawai_layout(self.G)
-        else:
-            self.pos = nx.spring_layout(self.G, k=2, iterations=50, seed=42)
+        if layout not in ('spring', 'circular', 'kamada_kawai'):
+            layout = 'spring'
+        
+        if pos is not None:
+            self._layout_cache[layout] = pos
+        elif layout not in self._layout_cache:
+            if layout == 'circular':
+                self._layout_cache[layout] = nx.circular_layout(self.G)
+            elif layout == 'kamada_kawai':
+                self._layout_cache[layout] = nx.kamada_kawai_layout(self.G)
+            else:
+                self._layout_cache[layout] = nx.spring_layout(self.G, k=2, iterations=50, seed=42)
+        
+        self.pos = self._layout_cache[layout]
     
     def draw_base_graph(self, 
                        node_color: str = '#3498db',
@@ -166,18 +175,18 @@ class GraphVisualizer:
             colors = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c']
             color_map = {i: colors[i % len(colors)] for i in set(coloring.values())}
         
-        for color_id, color in color_map.items():
-            nodes = [v for v, c in coloring.items() if c == color_id]
-            if nodes:
-                nx.draw_networkx_nodes(
-                    self.G, self.pos,
-                    nodelist=nodes,
-                    node_color=color,
-                    node_size=700,
-                    ax=self.ax,
-                    edgecolors='#2c3e50',
-                    linewidths=2.0
-                )
+        # Все вершины одним вызовом, цвет задаётся списком
+        nodes = [v for v in self.G.nodes() if v in coloring and coloring[v] in color_map]
+        if nodes:
+            nx.draw_networkx_nodes(
+                self.G, self.pos,
+                nodelist=nodes,
+                node_color=[color_map[coloring[v]] for v in nodes],
+                node_size=700,
+                ax=self.ax,
+                edgecolors='#2c3e50',
+                linewidths=2.0
+            )
     
     def highlight_components(self, components: List[List[int]],
                             color_map: Optional[Dict[int, str]] = None) -> None:
@@ -189,17 +198,19 @@ class GraphVisualizer:
             colors = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c']
             color_map = {i: colors[i % len(colors)] for i in range(len(components))}
         
-        for comp_id, component in enumerate(components):
-            color = color_map.get(comp_id, '#95a5a6')
-            nx.draw_networkx_nodes(
-                self.G, self.pos,
-                nodelist=component,
-                node_color=color,
-                node_size=700,
-                ax=self.ax,
-                edgecolors='#2c3e50',
-                linewidths=2.0
-            )
+        # Все компоненты одним вызовом, цвет задаётся списком
+        nodes = [v for component in components for v in component]
+        colors = [color_map.get(comp_id, '#95a5a6')
+                  for comp_id, component in enumerate(components) for _ in component]
+        nx.draw_networkx_nodes(
+            self.G, self.pos,
+            nodelist=nodes,
+            node_color=colors,
+            node_size=700,
+            ax=self.ax,
+            edgecolors='#2c3e50',
+            linewidths=2.0
+        )
     
     def set_title(self, title: str) -> None:
         """Установить заголовок"""
@@ -3,14 +3,129 @@ ui_visualizer.py - С ВЕСАМИ НА РЁБРАХ И ИСПРАВЛЕННЫМ
 ЗАПУСКАТЬ: python ui_visualizer.py
 """
 
+import hashlib
+import os
+from collections import OrderedDict
+
+import matplotlib
 import matplotlib.pyplot as plt
-from matplotlib.widgets import Button, Slider, RadioButtons
+
+# Окно на TkAgg (рендер Agg), если бэкенд не задан явно через MPLBACKEND;
+# без дисплея Tk не поднимется, и matplotlib выберет бэкенд сам
+# (force=False глушит ошибку только после импорта pyplot)
+if 'MPLBACKEND' not in os.environ:
+    matplotlib.use('TkAgg', force=False)
+
+# Упрощение длинных путей при отрисовке и разбиение их на куски для Agg
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+matplotlib.rcParams['agg.path.chunksize'] = 10000
+
+from matplotlib.widgets import Button, Slider, RadioButtons, CheckButtons
 import matplotlib.gridspec as gridspec
+from matplotlib.transforms import Bbox
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
 import numpy as np
 import networkx as nx
 
-from graph_generator import GraphGenerator
-from algorithm_runner import AlgorithmRunner
+# GraphGenerator и AlgorithmRunner импортируются при первом использовании:
+# algorithm_runner тянет за собой Numba, и окно без них открывается быстрее
+
+# Флажок Weights у нового графа включён, только если рёбер не больше этого:
+# на плотных графах (Complete) сотни Text-артистов доминируют во времени отрисовки
+MAX_EDGE_LABELS = 30
+
+# Сколько последних раскладок хранить (повторный Generate того же графа)
+POS_CACHE_SIZE = 8
+
+# Цвета выделения заранее переведены в RGBA - при каждом клике не разбираем hex-строки
+_COLORS = {name: to_rgba(c) for name, c in [
+    ('red', '#e74c3c'), ('dark_red', '#c0392b'),
+    ('orange', '#f39c12'), ('dark_orange', '#e67e22'),
+    ('green', '#2ecc71'), ('blue', '#3498db'),
+    ('black', 'black'), ('none', 'none'),
+]}
+# Палитры компонент связности, оттенков одной компоненты и раскраски
+_COMPONENT_COLORS = [to_rgba(c) for c in ['#e74c3c', '#3498db', '#2ecc71', '#f39c12',
+                                          '#9b59b6', '#1abc9c', '#e67e22', '#34495e']]
+_GRADIENT_COLORS = [to_rgba(c) for c in ['#e74c3c', '#e8645b', '#eb7a77', '#ee9091',
+                                         '#f1a6ab', '#f4bcc5', '#f7d2df']]
+_COLORING_COLORS = [to_rgba(c) for c in ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6',
+                                         '#1abc9c', '#e67e22', '#34495e', '#16a085', '#c0392b']]
+
+def _fast_spring_layout(G, k=0.5, iterations=50, seed=42):
+    """
+    Раскладка Fruchterman-Reingold на NumPy (как nx.spring_layout для малых графов)
+    Силы между всеми парами вершин считаются одной матричной операцией за итерацию
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: np.zeros(2)}
+    
+    # Матрица смежности с весами - сила притяжения по рёбрам
+    idx = {v: i for i, v in enumerate(nodes)}
+    A = np.zeros((n, n))
+    for u, v, w in G.edges(data='weight', default=1):
+        A[idx[u], idx[v]] = A[idx[v], idx[u]] = w
+    
+    pos = np.random.RandomState(seed).rand(n, 2)
+    # "Температура" - максимальный шаг, линейно остывает к концу
+    t = (pos.max(axis=0) - pos.min(axis=0)).max() * 0.1
+    dt = t / (iterations + 1)
+    
+    for _ in range(iterations):
+        delta = pos[:, np.newaxis, :] - pos[np.newaxis, :, :]
+        dist = np.linalg.norm(delta, axis=-1).clip(min=0.01)
+        # Отталкивание всех пар k²/d минус притяжение соседей d²/k (вдоль delta / d)
+        disp = np.einsum('ijk,ij->ik', delta, k * k / dist ** 2 - A * dist / k)
+        length = np.linalg.norm(disp, axis=-1).clip(min=0.01)
+        step = disp * (t / length)[:, np.newaxis]
+        pos += step
+        t -= dt
+        if np.linalg.norm(step) / n < 1e-4:
+            break
+    
+    # Центрируем и масштабируем в [-1, 1]
+    pos -= pos.mean(axis=0)
+    lim = np.abs(pos).max()
+    if lim > 0:
+        pos /= lim
+    return dict(zip(nodes, pos))
+
+
+def _layout_by_type(G, graph_type):
+    """
+    Раскладка по типу графа
+    У структурных графов (цикл, сетка, путь, полный) позиции задаются формулой
+    без итераций, остальные - быстрой пружинной раскладкой
+    """
+    if graph_type in ('Circle', 'Complete'):
+        return nx.circular_layout(G)
+    if graph_type == 'Grid':
+        # UI строит квадратную сетку, вершина r * side + c; строка 0 - сверху
+        side = max(1, round(np.sqrt(G.number_of_nodes())))
+        return {v: np.array([v % side, -(v // side)], dtype=float) for v in G.nodes()}
+    if graph_type == 'Path':
+        return {v: np.array([v, 0.0]) for v in G.nodes()}
+    return _fast_spring_layout(G, k=0.5, iterations=50, seed=42)
+
+
+def _edges_to_array(edges):
+    """Рёбра (кортежи или dict) -> структурированный массив с полями u, v, w"""
+    if edges and isinstance(edges[0], dict):
+        rows = [(e['source'], e['target'], e.get('weight', 1)) for e in edges]
+    else:
+        rows = [(e[0], e[1], e[2] if len(e) > 2 else 1) for e in edges]
+    return np.array(rows, dtype=[('u', 'i4'), ('v', 'i4'), ('w', 'f8')])
+
+
+def _int_key(key):
+    """Ключ вершины как int, если он записан числом (после JSON ключи - строки)"""
+    return int(key) if str(key).lstrip('-').isdigit() else key
 
 
 class GraphVisualizerApp:
@@ -22,10 +137,33 @@ class GraphVisualizerApp:
         self.selected_algorithm = None
         self.G = None
         self.pos = None
+        self._pos_cache = OrderedDict()  # (тип, сигнатура графа) -> позиции вершин, LRU
+        self._sig = None      # сигнатура текущего графа
+        self._result_cache = {}  # (сигнатура, алгоритм) -> результат, только для текущего графа
+        self._last_drawn_key = None  # (сигнатура, алгоритм) последней отрисовки
+        self._idx = {}        # вершина -> строка в _xy
+        self._edges_arr = None  # рёбра графа: структурированный массив (u, v, w)
+        self._xy = None       # позиции вершин массивом (N, 2)
+        
+        # Blitting: фон (рёбра, веса) рисуется один раз на граф,
+        # передний план (вершины, подсветка, заголовок, панель информации) -
+        # поверх сохранённого фона
+        self._bg = None  # сохранённые области фона, по одной на каждый _blit_boxes
+        self._base_stale = True
+        self._base_nodes = None
+        self._node_labels = []
+        self._edge_label_strs = {}      # (u, v) -> подпись веса, считается один раз на граф
+        self._edge_label_artists = {}   # (u, v) -> Text подписи на графике
+        self._info_header = ''          # блок GRAPH INFO, не зависит от алгоритма
+        self._overlay_edges = None  # LineCollection выделенных рёбер
+        self._overlay_nodes = None  # PathCollection выделенных вершин
+        self._blit_boxes = []
+        self._covering_axes = []
         
         # Окно
         self.fig = plt.figure(figsize=(20, 14))
         self.fig.suptitle('GRAPH ALGORITHMS VISUALIZATION', fontsize=18, fontweight='bold')
+        self.fig.canvas.mpl_connect('draw_event', self.on_draw)
         
         # Сетка
         gs = gridspec.GridSpec(3, 3, figure=self.fig, hspace=0.35, wspace=0.3)
@@ -37,6 +175,10 @@ class GraphVisualizerApp:
         # Информация справа
         self.ax_info = self.fig.add_subplot(gs[0:2, 2])
         self.ax_info.axis('off')
+        self._info_text = self.ax_info.text(0.1, 0.9, '', transform=self.ax_info.transAxes, fontsize=10,
+                                            verticalalignment='top', fontfamily='monospace',
+                                            bbox=dict(boxstyle='round', facecolor='#ecf0f1', alpha=0.8),
+                                            animated=True)
         
         # ===== КНОПКИ =====
         # Первый ряд кнопок
@@ -69,6 +211,10 @@ class GraphVisualizerApp:
         self.btn_hotel = Button(self.ax_btn_hotel, 'Hotel', color='#34495e', hovercolor='#2c3e50')
         self.btn_hotel.on_clicked(lambda e: self.on_run_algorithm('hotel'))
         
+        self.ax_check_weights = self.fig.add_axes([0.32, 0.30, 0.08, 0.05])
+        self.check_weights = CheckButtons(self.ax_check_weights, ['Weights'], [True])
+        self.check_weights.on_clicked(self.on_toggle_weights)
+        
         # ===== СЛАЙДЕРЫ =====
         self.ax_slider_v = self.fig.add_axes([0.05, 0.23, 0.35, 0.03])
         self.slider_vertices = Slider(self.ax_slider_v, 'Vertices', 3, 15, valinit=8, valstep=1, color='#3498db')
@@ -107,6 +253,7 @@ class GraphVisualizerApp:
         num_vertices = int(self.slider_vertices.val)
         edge_prob = self.slider_prob.val
         
+        from graph_generator import GraphGenerator
         gen = GraphGenerator()
         
         try:
@@ -125,6 +272,12 @@ class GraphVisualizerApp:
             self.current_results = {}
             self.selected_algorithm = None
             
+            # Результаты храним только для текущего графа
+            self._result_cache = {}
+            
+            # Рёбра приводим к массиву один раз - дальше формат не проверяется
+            self._edges_arr = _edges_to_array(self.graph_data['edges'])
+            
             # Создаём NetworkX граф
             self.create_networkx_graph()
             
@@ -134,28 +287,94 @@ class GraphVisualizerApp:
     
     def create_networkx_graph(self):
         """Создаёт NetworkX граф из data"""
+        arr = self._edges_arr
+        graph_type = self.radio_graph_type.value_selected
+        
         self.G = nx.Graph()
         
         # Добавляем вершины
-        for v in self.graph_data['vertices']:
-            self.G.add_node(v)
+        self.G.add_nodes_from(self.graph_data['vertices'])
         
         # Добавляем рёбра с весами
-        for edge in self.graph_data['edges']:
-            if isinstance(edge, dict):
-                u, v, w = edge['source'], edge['target'], edge.get('weight', 1)
-            else:
-                u, v, w = edge[0], edge[1], edge[2] if len(edge) > 2 else 1
-            self.G.add_edge(u, v, weight=w)
-        
-        # Вычисляем позиции
-        self.pos = nx.spring_layout(self.G, k=0.5, iterations=50, seed=42)
+        self.G.add_weighted_edges_from(zip(arr['u'].tolist(), arr['v'].tolist(), arr['w'].tolist()))
+        
+        # Подписи весов не меняются до следующего графа
+        self._edge_label_strs = {(u, v): f"{w:.1f}" for u, v, w in self.G.edges(data='weight')}
+        
+        # Сведения о графе для панели информации - тоже один раз на граф
+        n = self.graph_data['num_vertices']
+        e = self.graph_data['num_edges']
+        max_edges = n * (n - 1) // 2
+        density = (e / max_edges * 100) if max_edges > 0 else 0
+        
+        self._info_header = f"""GRAPH INFO
+─────────────
+V: {n}
+E: {e}
+Type: {graph_type}
+Density: {density:.1f}%"""
+        
+        # Вычисляем позиции (тот же граф - те же позиции, без повторного расчёта)
+        self._sig = self.graph_signature()
+        key = (graph_type, self._sig)
+        if key in self._pos_cache:
+            self._pos_cache.move_to_end(key)
+        else:
+            self._pos_cache[key] = _layout_by_type(self.G, graph_type)
+            if len(self._pos_cache) > POS_CACHE_SIZE:
+                self._pos_cache.popitem(last=False)
+        self.pos = self._pos_cache[key]
+        self._idx = {n: i for i, n in enumerate(self.G.nodes())}
+        self._xy = np.array([self.pos[n] for n in self.G.nodes()]).reshape(-1, 2)
+        
+        # Подписи весов по умолчанию - только на не слишком плотных графах
+        self._set_weights_checkbox(self.G.number_of_edges() <= MAX_EDGE_LABELS)
+        
+        # Граф изменился - фон нужно нарисовать заново
+        self._base_stale = True
+        self._bg = None
+    
+    def _set_weights_checkbox(self, state):
+        """Выставить флажок Weights без вызова on_toggle_weights и без отдельной отрисовки"""
+        if self.check_weights.get_status()[0] == state:
+            return
+        self.check_weights.eventson = False
+        self.check_weights.drawon = False
+        self.check_weights.set_active(0)
+        self.check_weights.eventson = True
+        self.check_weights.drawon = True
+    
+    def graph_signature(self):
+        """
+        Хэш текущего графа: число вершин и отсортированные рёбра с весами
+        (веса влияют на раскладку и на результаты алгоритмов)
+        """
+        edges = sorted((min(u, v), max(u, v), w) for u, v, w in self.G.edges(data='weight'))
+        return hashlib.blake2b(repr((self.G.number_of_nodes(), edges)).encode()).digest()
     
     def on_generate_graph(self, event):
         """Нажата кнопка Generate"""
         self.generate_graph_by_type()
-        self.draw_graph()
-        self.update_info()
+        if self.draw_graph():
+            self.update_info()
+            self.blit()
+    
+    def on_toggle_weights(self, label):
+        """Переключён флажок Weights - показать/скрыть подписи весов"""
+        if self.G is None:
+            return
+        
+        show = self.check_weights.get_status()[0]
+        if show and not self._edge_label_artists:
+            # Подписи ещё не созданы - строим фон заново
+            self._base_stale = True
+            self.draw_graph()
+        else:
+            for text in self._edge_label_artists.values():
+                text.set_visible(show)
+            # Подписи - часть фона, его нужно снять заново
+            self._bg = None
+        self.blit()
     
     def on_run_algorithm(self, algorithm_name):
         """Нажата кнопка алгоритма"""
@@ -166,39 +385,161 @@ class GraphVisualizerApp:
         print(f"Running {algorithm_name}...")
         
         try:
-            results = AlgorithmRunner.run_algorithm(algorithm_name, self.graph_data)
+            # Повторный клик по тому же алгоритму на том же графе - без пересчёта
+            key = (self._sig, algorithm_name)
+            if key not in self._result_cache:
+                from algorithm_runner import AlgorithmRunner
+                self._result_cache[key] = AlgorithmRunner.run_algorithm(algorithm_name, self.graph_data)
+            results = self._result_cache[key]
             self.current_results = results
             self.selected_algorithm = algorithm_name
             print(f"OK: {algorithm_name} done!")
             
-            self.draw_graph()
-            self.update_info()
+            if self.draw_graph():
+                self.update_info()
+                self.blit()
         except Exception as e:
             print(f"ERROR: {e}")
     
-    def draw_graph(self):
-        """Рисует граф"""
+    def draw_base_graph(self):
+        """Рисует граф без выделения: рёбра и веса - фон, вершины - передний план"""
         self.ax_main.clear()
         
-        if self.G is None or self.pos is None:
-            return
-        
         # Базовый граф - серые рёбра
         nx.draw_networkx_edges(self.G, self.pos, ax=self.ax_main, width=1.5, alpha=0.6, edge_color='#888888')
         
-        # НОВОЕ: Отображение весов на рёбрах
-        edge_labels = nx.get_edge_attributes(self.G, 'weight')
-        edge_labels = {k: f"{v:.1f}" for k, v in edge_labels.items()}
-        nx.draw_networkx_edge_labels(self.G, self.pos, edge_labels, ax=self.ax_main, font_size=7)
+        # НОВОЕ: Отображение весов на рёбрах (если включён флажок Weights)
+        if self.check_weights.get_status()[0]:
+            self._edge_label_artists = nx.draw_networkx_edge_labels(self.G, self.pos, self._edge_label_strs,
+                                                                    ax=self.ax_main, font_size=7)
+        else:
+            self._edge_label_artists = {}
         
         # Базовые вершины - синие
         node_colors = ['#3498db'] * len(self.G.nodes())
-        nx.draw_networkx_nodes(self.G, self.pos, ax=self.ax_main, node_color=node_colors, 
-                               node_size=600, edgecolors='#2c3e50', linewidths=2)
+        self._base_nodes = nx.draw_networkx_nodes(self.G, self.pos, ax=self.ax_main, node_color=node_colors,
+                                                  node_size=600, edgecolors='#2c3e50', linewidths=2)
         
         # Метки вершин
-        nx.draw_networkx_labels(self.G, self.pos, ax=self.ax_main, font_size=10, 
-                                font_weight='bold', font_color='white')
+        self._node_labels = list(nx.draw_networkx_labels(self.G, self.pos, ax=self.ax_main, font_size=10,
+                                                         font_weight='bold', font_color='white').values())
+        
+        # Вершины должны быть поверх выделенных рёбер - рисуем их вместе с выделением
+        self._base_nodes.set_animated(True)
+        for label in self._node_labels:
+            label.set_animated(True)
+        self.ax_main.title.set_animated(True)
+        self.ax_main.axis('off')
+        
+        # Кнопки, заходящие на область графа, рисуются поверх переднего плана
+        self._covering_axes = [ax for ax in self.fig.axes
+                               if ax is not self.ax_main and ax.bbox.overlaps(self.ax_main.bbox)]
+        for ax in self._covering_axes:
+            ax.set_animated(True)
+        
+        # Выделение алгоритма - по одной коллекции рёбер и вершин на граф,
+        # draw_graph только подменяет их данные
+        self._overlay_edges = LineCollection([], linewidths=4, alpha=0.9, antialiaseds=(1,), zorder=1)
+        self.ax_main.add_collection(self._overlay_edges, autolim=False)
+        self._overlay_nodes = self.ax_main.scatter([], [], marker='o', zorder=2)
+        self._overlay_edges.set_animated(True)
+        self._overlay_nodes.set_animated(True)
+        
+        self._base_stale = False
+        self._bg = None
+    
+    def set_overlay_edges(self, edge_list, color):
+        """Выделить рёбра: обновить сегменты общей LineCollection"""
+        pairs = np.array([(self._idx[u], self._idx[v]) for u, v in edge_list], dtype=np.intp).reshape(-1, 2)
+        self.set_overlay_segments(self._xy[pairs], color)
+    
+    def set_overlay_segments(self, segments, color):
+        """Выделить готовые сегменты (k, 2, 2)"""
+        self._overlay_edges.set_segments(segments)
+        self._overlay_edges.set_color(color)
+    
+    def set_overlay_nodes(self, node_list, color, size, edgecolor, linewidth):
+        """Выделить вершины: обновить точки общей PathCollection"""
+        rows = np.array([self._idx[n] for n in node_list], dtype=np.intp)
+        self._overlay_nodes.set_offsets(self._xy[rows])
+        self._overlay_nodes.set_sizes([size])
+        self._overlay_nodes.set_facecolor(color)
+        self._overlay_nodes.set_edgecolor(edgecolor)
+        self._overlay_nodes.set_linewidth(linewidth)
+    
+    def _foreground(self):
+        """Артисты переднего плана в порядке отрисовки"""
+        return [self._overlay_edges, self._base_nodes, self._overlay_nodes,
+                *self._node_labels, self.ax_main.title, self._info_text]
+    
+    def _draw_foreground(self, renderer):
+        for artist in self._foreground():
+            artist.draw(renderer)
+        for ax in self._covering_axes:
+            ax.draw(renderer)
+    
+    def on_draw(self, event):
+        """После полной перерисовки: запомнить фон и дорисовать передний план"""
+        if self._base_nodes is None:
+            return
+        
+        # При сохранении в файл animated-артисты графа рисуются обычным порядком,
+        # а animated-оси фигура пропускает всегда - дорисовываем кнопки
+        if self.fig.canvas.is_saving():
+            for ax in self._covering_axes:
+                ax.draw(event.renderer)
+            return
+        
+        # Область графа вместе с заголовком над ним и заходящими на неё кнопками
+        bbox = self.ax_main.bbox
+        title_top = self.ax_main.title.get_window_extent(event.renderer).y1
+        box = Bbox.from_extents(bbox.x0, bbox.y0, bbox.x1, max(bbox.y1, title_top) + 5)
+        box = Bbox.union([box] + [ax.bbox.padded(2) for ax in self._covering_axes])
+        self._blit_boxes = [box, self.ax_info.bbox]
+        
+        if self.fig.canvas.supports_blit:
+            self._bg = [self.fig.canvas.copy_from_bbox(b) for b in self._blit_boxes]
+        self._draw_foreground(event.renderer)
+    
+    def blit(self):
+        """
+        Перерисовать только передний план поверх сохранённого фона
+        
+        Единственная перерисовка за событие: draw_graph и update_info
+        только обновляют артисты, обработчики кнопок вызывают blit в конце
+        """
+        canvas = self.fig.canvas
+        if self._bg is None:
+            canvas.draw_idle()
+            return
+        for region in self._bg:
+            canvas.restore_region(region)
+        self._draw_foreground(canvas.get_renderer())
+        for box in self._blit_boxes:
+            canvas.blit(box)
+    
+    def draw_graph(self):
+        """
+        Рисует граф
+        
+        Returns:
+            False, если граф и алгоритм те же, что при прошлой отрисовке,
+            и перерисовывать нечего
+        """
+        if self.G is None or self.pos is None:
+            return False
+        
+        # Новый граф (даже совпадающий с прошлым) и флажок Weights помечают фон устаревшим
+        key = (self._sig, self.selected_algorithm)
+        if key == self._last_drawn_key and not self._base_stale:
+            return False
+        
+        if self._base_stale:
+            self.draw_base_graph()
+        
+        # Убираем выделение предыдущего алгоритма
+        self.set_overlay_edges([], _COLORS['none'])
+        self.set_overlay_nodes([], _COLORS['none'], 0, _COLORS['none'], 0)
         
         # Выделение результатов алгоритма
         if self.current_results and self.selected_algorithm:
@@ -208,128 +549,90 @@ class GraphVisualizerApp:
                 # Кратчайший путь - красная линия
                 vertices = self.graph_data['vertices']
                 if len(vertices) > 1:
-                    parent = results.get('parent', {})
+                    # Ключи parent - строки (как в JSON); переводим в int один раз до обхода
+                    parent = {int(k): int(v) for k, v in results.get('parent', {}).items()}
                     end_vertex = vertices[-1]
                     
                     path = []
                     current = end_vertex
                     while current != -1:
                         path.append(current)
-                        current = parent.get(str(current), -1)
+                        current = parent.get(current, -1)
                     path.reverse()
                     
                     if path and path[0] == vertices[0]:
                         path_edges = [(path[i], path[i+1]) for i in range(len(path)-1)]
-                        nx.draw_networkx_edges(self.G, self.pos, edgelist=path_edges, ax=self.ax_main, 
-                                              width=4, edge_color='#e74c3c', alpha=0.9)
-                        nx.draw_networkx_nodes(self.G, self.pos, nodelist=path, ax=self.ax_main,
-                                              node_color='#e74c3c', node_size=700, edgecolors='#c0392b', linewidths=2.5)
+                        self.set_overlay_edges(path_edges, _COLORS['red'])
+                        self.set_overlay_nodes(path, _COLORS['red'], 700, _COLORS['dark_red'], 2.5)
             
             elif self.selected_algorithm == 'tsp':
                 # Тур - оранжевая линия
                 tour = results.get('tour', [])
                 if tour:
-                    tour_edges = [(tour[i], tour[(i+1) % len(tour)]) for i in range(len(tour))]
-                    nx.draw_networkx_edges(self.G, self.pos, edgelist=tour_edges, ax=self.ax_main,
-                                          width=4, edge_color='#f39c12', alpha=0.9)
-                    nx.draw_networkx_nodes(self.G, self.pos, nodelist=tour, ax=self.ax_main,
-                                          node_color='#f39c12', node_size=700, edgecolors='#e67e22', linewidths=2.5)
+                    # Ребро i -> i+1 (по кругу): сегменты из строк _xy и их сдвига
+                    rows = np.array([self._idx[n] for n in tour], dtype=np.intp)
+                    segments = np.stack([self._xy[rows], self._xy[np.roll(rows, -1)]], axis=1)
+                    self.set_overlay_segments(segments, _COLORS['orange'])
+                    self.set_overlay_nodes(tour, _COLORS['orange'], 700, _COLORS['dark_orange'], 2.5)
             
             elif self.selected_algorithm == 'mst':
                 # MST - зелёные рёбра
                 mst_edges = results.get('mst_edges', [])
                 if mst_edges:
-                    mst_edge_list = []
-                    for e in mst_edges:
-                        if isinstance(e, dict):
-                            mst_edge_list.append((e['source'], e['target']))
-                        else:
-                            mst_edge_list.append((e[0], e[1]))
-                    nx.draw_networkx_edges(self.G, self.pos, edgelist=mst_edge_list, ax=self.ax_main,
-                                          width=4, edge_color='#2ecc71', alpha=0.9)
+                    mst_arr = _edges_to_array(mst_edges)
+                    mst_edge_list = list(zip(mst_arr['u'].tolist(), mst_arr['v'].tolist()))
+                    self.set_overlay_edges(mst_edge_list, _COLORS['green'])
             
             elif self.selected_algorithm == 'connectivity':
                 # ИСПРАВЛЕНО: Компоненты - разные цвета
                 # Даже если граф connected - покрасим в разные цвета для демонстрации
                 components = results.get('components', [])
                 if components:
-                    colors = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#e67e22', '#34495e']
-                    for i, component in enumerate(components):
-                        color = colors[i % len(colors)]
-                        nx.draw_networkx_nodes(self.G, self.pos, nodelist=component, ax=self.ax_main,
-                                              node_color=color, node_size=700, edgecolors='black', linewidths=2)
+                    colors = _COMPONENT_COLORS
                     
                     # Если только 1 компонент - подскрасим вершины в разные оттенки
                     if len(components) == 1:
-                        component = components[0]
-                        colors_gradient = ['#e74c3c', '#e8645b', '#eb7a77', '#ee9091', '#f1a6ab', '#f4bcc5', '#f7d2df']
-                        for idx, node in enumerate(component):
-                            color = colors_gradient[idx % len(colors_gradient)]
-                            nx.draw_networkx_nodes(self.G, self.pos, nodelist=[node], ax=self.ax_main,
-                                                  node_color=color, node_size=700, edgecolors='black', linewidths=2)
+                        node_list = components[0]
+                        colors_gradient = _GRADIENT_COLORS
+                        node_colors = [colors_gradient[idx % len(colors_gradient)] for idx in range(len(node_list))]
+                    else:
+                        node_list = [node for component in components for node in component]
+                        node_colors = [colors[i % len(colors)] for i, component in enumerate(components)
+                                       for _ in component]
+                    
+                    self.set_overlay_nodes(node_list, node_colors, 700, _COLORS['black'], 2)
             
             elif self.selected_algorithm == 'coloring':
                 # Раскраска - разные цвета для каждой вершины
                 coloring = results.get('coloring', {})
                 if coloring and len(coloring) > 0:
-                    colors_map = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#e67e22', '#34495e', '#16a085', '#c0392b']
-                    
-                    node_colors_dict = {}
-                    for node in self.G.nodes():
-                        node_key = None
-                        if str(node) in coloring:
-                            node_key = str(node)
-                        elif node in coloring:
-                            node_key = node
-                        elif int(node) in coloring:
-                            node_key = int(node)
-                        
-                        if node_key is not None:
-                            try:
-                                color_idx = int(coloring[node_key])
-                                node_colors_dict[node] = colors_map[color_idx % len(colors_map)]
-                            except:
-                                node_colors_dict[node] = '#3498db'
-                        else:
-                            node_colors_dict[node] = '#3498db'
+                    colors_map = _COLORING_COLORS
                     
-                    node_list = list(node_colors_dict.keys())
-                    colors_final = [node_colors_dict[n] for n in node_list]
+                    # Ключи раскраски и вершины приводим к одному виду один раз
+                    norm = {_int_key(k): int(c) for k, c in coloring.items()}
+                    node_list = list(self.G.nodes())
+                    color_idx = [norm.get(_int_key(n)) for n in node_list]
+                    colors_final = [_COLORS['blue'] if c is None else colors_map[c % len(colors_map)] for c in color_idx]
                     
-                    nx.draw_networkx_nodes(self.G, self.pos, nodelist=node_list, ax=self.ax_main,
-                                          node_color=colors_final, node_size=700, edgecolors='black', linewidths=2)
+                    self.set_overlay_nodes(node_list, colors_final, 700, _COLORS['black'], 2)
             
             elif self.selected_algorithm == 'hotel':
                 # Центры - красные большие вершины
                 centers = results.get('centers', [])
                 if centers:
-                    nx.draw_networkx_nodes(self.G, self.pos, nodelist=centers, ax=self.ax_main,
-                                          node_color='#e74c3c', node_size=900, edgecolors='#c0392b', linewidths=3)
+                    self.set_overlay_nodes(centers, _COLORS['red'], 900, _COLORS['dark_red'], 3)
         
         title = f"Graph: {self.graph_data['num_vertices']} v, {self.graph_data['num_edges']} e"
         if self.selected_algorithm:
             title += f" | {self.selected_algorithm.upper()}"
         
         self.ax_main.set_title(title, fontsize=12, fontweight='bold')
-        self.ax_main.axis('off')
-        self.fig.canvas.draw_idle()
+        self._last_drawn_key = key
+        return True
     
     def update_info(self):
         """Обновляет информацию"""
-        self.ax_info.clear()
-        self.ax_info.axis('off')
-        
-        n = self.graph_data['num_vertices']
-        e = self.graph_data['num_edges']
-        max_edges = n * (n - 1) // 2
-        density = (e / max_edges * 100) if max_edges > 0 else 0
-        
-        info = f"""GRAPH INFO
-─────────────
-V: {n}
-E: {e}
-Type: {self.radio_graph_type.value_selected}
-Density: {density:.1f}%"""
+        info = self._info_header
         
         if self.current_results and self.selected_algorithm:
             results = self.current_results
@@ -349,11 +652,7 @@ Density: {density:.1f}%"""
             elif self.selected_algorithm == 'hotel':
                 info += f"\nCenters: {results.get('num_centers', 0)}"
         
-        self.ax_info.text(0.1, 0.9, info, transform=self.ax_info.transAxes, fontsize=10,
-                         verticalalignment='top', fontfamily='monospace',
-                         bbox=dict(boxstyle='round', facecolor='#ecf0f1', alpha=0.8))
-        
-        self.fig.canvas.draw_idle()
+        self._info_text.set_text(info)
 
 
 def main():